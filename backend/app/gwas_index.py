@@ -0,0 +1,91 @@
+import json
+import os
+import numpy as np
+
+INDEX_DIR = "models/gwas_index"
+
+
+class GwasIndex:
+    """Read-only SNP/gene -> trait lookups over memory-mapped arrays built by training/build_gwas_index.py."""
+
+    def __init__(self, index_dir):
+        def load(name):
+            return np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+
+        self.snp_keys = load("snp_keys")
+        self.snp_offsets = load("snp_offsets")
+        self.assoc_snp = load("assoc_snp")
+        self.assoc_trait = load("assoc_trait")
+        self.assoc_effect = load("assoc_effect")
+        self.assoc_raf = load("assoc_raf")
+        self.gene_keys = load("gene_keys")
+        self.gene_offsets = load("gene_offsets")
+        self.gene_assoc = load("gene_assoc")
+
+        with open(os.path.join(index_dir, "traits.json")) as f:
+            self.traits = json.load(f)
+
+    @staticmethod
+    def _find(keys, key):
+        encoded = key.encode("utf-8")
+        if len(encoded) > keys.dtype.itemsize:
+            return -1
+        pos = int(np.searchsorted(keys, encoded))
+        if pos < len(keys) and keys[pos] == encoded:
+            return pos
+        return -1
+
+    def _associations(self, rows):
+        return [
+            {
+                "snp": self.snp_keys[self.assoc_snp[row]].decode("utf-8"),
+                "trait": self.traits[self.assoc_trait[row]],
+                "effect_midpoint": float(self.assoc_effect[row]),
+                "risk_allele_frequency": float(self.assoc_raf[row])
+            }
+            for row in rows
+        ]
+
+    def lookup_snp(self, snp_id):
+        pos = self._find(self.snp_keys, snp_id)
+        if pos >= 0:
+            positions = [pos]
+        else:
+            # Bare rsID: match every allele-suffixed key ("rs123" -> "rs123-A", "rs123-T")
+            prefix = f"{snp_id}-".encode("utf-8")
+            if len(prefix) > self.snp_keys.dtype.itemsize:
+                return None
+            start = int(np.searchsorted(self.snp_keys, prefix))
+            positions = []
+            while start < len(self.snp_keys) and self.snp_keys[start].startswith(prefix):
+                positions.append(start)
+                start += 1
+            if not positions:
+                return None
+
+        rows = [row for p in positions
+                for row in range(self.snp_offsets[p], self.snp_offsets[p + 1])]
+        associations = self._associations(rows)
+        return {
+            "snp": snp_id,
+            "trait_count": len({a["trait"] for a in associations}),
+            "associations": associations
+        }
+
+    def lookup_gene(self, gene_name):
+        gene = gene_name.strip().upper()
+        pos = self._find(self.gene_keys, gene)
+        if pos < 0:
+            return None
+
+        rows = self.gene_assoc[self.gene_offsets[pos]:self.gene_offsets[pos + 1]]
+        associations = self._associations(rows)
+        return {
+            "gene": gene,
+            "snp_count": len({a["snp"] for a in associations}),
+            "trait_count": len({a["trait"] for a in associations}),
+            "associations": associations
+        }
+
+
+gwas_index = GwasIndex(INDEX_DIR) if os.path.isdir(INDEX_DIR) else None
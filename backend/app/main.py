@@ -1,10 +1,20 @@
 import os
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.model_loader import STARTUP_MODE, start_background_load
 from app.routes import router
 
-app = FastAPI(title="Disease SNP Prediction API")
+
+@asynccontextmanager
+async def lifespan(app):
+    if STARTUP_MODE == "lazy":
+        start_background_load()
+    yield
+
+
+app = FastAPI(title="Disease SNP Prediction API", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -1,49 +1,176 @@
-import tensorflow as tf
+import logging
+import os
+import threading
+import time
 import numpy as np
-import joblib
+from functools import lru_cache
 
 MODEL_PATH = "models/best_disease_model.keras"
 SCALER_PATH = "models/disease_scaler.pkl"
 INFO_PATH = "models/model_info.pkl"
 
-model = tf.keras.models.load_model(MODEL_PATH)
-scaler = joblib.load(SCALER_PATH)
-model_info = joblib.load(INFO_PATH)
+# "eager": load everything at import (default). "lazy": the app starts serving at once and
+# TensorFlow, the model and the scaler are imported/loaded on a background thread.
+STARTUP_MODE = os.environ.get("STARTUP_MODE", "eager")
+LOAD_TIMEOUT = float(os.environ.get("MODEL_LOAD_TIMEOUT", "60"))
 
-feature_columns = model_info["feature_columns"]
-target_columns = model_info["target_columns"]
+logger = logging.getLogger("uvicorn.error")
+
+model = None
+scaler = None
+model_info = None
+feature_columns = []
+target_columns = []
+feature_index = {}
+disease_thresholds = []
+risk_cutoffs = []
+
+model_ready = threading.Event()
+load_finished = threading.Event()
+load_error = None
+startup_timings = {}
+
+
+def load_artifacts():
+    global model, scaler, model_info, feature_columns, target_columns, feature_index
+    global disease_thresholds, risk_cutoffs
+
+    def phase(name, start):
+        startup_timings[name] = round(time.perf_counter() - start, 3)
+        logger.info(f"startup: {name} {startup_timings[name]:.3f}s")
+
+    total = time.perf_counter()
+
+    start = time.perf_counter()
+    import tensorflow as tf
+    import joblib
+    phase("import_tensorflow", start)
+
+    start = time.perf_counter()
+    model = tf.keras.models.load_model(MODEL_PATH)
+    phase("load_model", start)
+
+    start = time.perf_counter()
+    scaler = joblib.load(SCALER_PATH)
+    model_info = joblib.load(INFO_PATH)
+    phase("load_scaler_and_info", start)
+
+    feature_columns = model_info["feature_columns"]
+    target_columns = model_info["target_columns"]
+    feature_index = {snp: i for i, snp in enumerate(feature_columns)}
+
+    # Per-disease thresholds from training/calibration.py; older model_info files only have the global one.
+    # Risk bands scale with each threshold and reduce to the old 0.3/0.5/0.7 cutoffs at 0.5.
+    disease_thresholds = [
+        model_info.get("thresholds", {}).get(disease, model_info.get("threshold", 0.5))
+        for disease in target_columns
+    ]
+    risk_cutoffs = [
+        (t + 0.4 * (1 - t), t, 0.6 * t)
+        for t in disease_thresholds
+    ]
+
+    # Trace the predict function now so the first real request doesn't pay for it
+    start = time.perf_counter()
+    model.predict(scaler.transform(np.zeros((1, len(feature_columns)))), verbose=0)
+    phase("warmup_predict", start)
+
+    phase("total", total)
+    model_ready.set()
+
+
+def _load_in_background():
+    global load_error
+    try:
+        load_artifacts()
+    except Exception as e:
+        load_error = e
+        logger.exception("startup: loading model artifacts failed")
+    finally:
+        load_finished.set()
+
+
+def start_background_load():
+    threading.Thread(target=_load_in_background, name="model-loader", daemon=True).start()
+
+
+def wait_until_ready(timeout=LOAD_TIMEOUT):
+    load_finished.wait(timeout)
+    if not model_ready.is_set():
+        raise RuntimeError("Model is still loading" if load_error is None else f"Model failed to load: {load_error}")
+
+
+if STARTUP_MODE != "lazy":
+    load_artifacts()
+    load_finished.set()
 
 
 def prepare_features(snp_list):
     features = np.zeros((1, len(feature_columns)))
     for snp in snp_list:
-        if snp in feature_columns:
-            features[0, feature_columns.index(snp)] = 1
+        if snp in feature_index:
+            features[0, feature_index[snp]] = 1
     return features
 
 
-def predict_diseases(features, threshold=0.5):
+def predict_diseases(features, threshold=None):
     features_scaled = scaler.transform(features)
     predictions = model.predict(features_scaled, verbose=0)[0]
+    return format_predictions(predictions, threshold)
+
 
+def format_predictions(predictions, threshold=None):
     results = {}
     for i, disease in enumerate(target_columns):
         prob = float(predictions[i])
+        high, medium, low = risk_cutoffs[i]
 
-        if prob > 0.7:
+        if prob > high:
             risk = "HIGH"
-        elif prob > 0.5:
+        elif prob > medium:
             risk = "MEDIUM"
-        elif prob > 0.3:
+        elif prob > low:
             risk = "LOW"
         else:
             risk = "VERY LOW"
 
         results[disease] = {
             "probability": prob,
-            "has_disease": prob > threshold,
+            "has_disease": prob > (disease_thresholds[i] if threshold is None else threshold),
             "risk_level": risk,
             "percentage": f"{prob * 100:.1f}%"
         }
 
     return results
+
+
+@lru_cache(maxsize=1024)
+def _occlusion(snps):
+    # Row 0 is the patient; row i + 1 drops snps[i]. One forward pass for all of them.
+    batch = np.zeros((len(snps) + 1, len(feature_columns)))
+    cols = [feature_index[snp] for snp in snps]
+    batch[:, cols] = 1
+    batch[np.arange(1, len(snps) + 1), cols] = 0
+
+    probs = model.predict(scaler.transform(batch), verbose=0)
+    return probs[0], probs[0] - probs[1:]
+
+
+def explain_diseases(snp_list, top_k=5):
+    """Occlusion explanation: how much each recognised SNP raises (or lowers) each disease probability."""
+    snps = tuple(sorted({snp for snp in snp_list if snp in feature_index}))
+    if not snps:
+        features_scaled = scaler.transform(prepare_features([]))
+        return model.predict(features_scaled, verbose=0)[0], {d: [] for d in target_columns}
+
+    predictions, deltas = _occlusion(snps)
+
+    explanations = {}
+    for i, disease in enumerate(target_columns):
+        order = np.argsort(-np.abs(deltas[:, i]))[:top_k]
+        explanations[disease] = [
+            {"snp": snps[j], "contribution": float(deltas[j, i])}
+            for j in order
+        ]
+
+    return predictions, explanations
@@ -1,27 +1,69 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from app.model_loader import prepare_features, predict_diseases, feature_columns
+from pydantic import BaseModel, Field
+from app.model_loader import (prepare_features, predict_diseases, format_predictions,
+                              explain_diseases, wait_until_ready, model_ready,
+                              startup_timings, STARTUP_MODE)
+from app.gwas_index import gwas_index
+from app import model_loader
 
 router = APIRouter(prefix="/api")
 
+MAX_BATCH_LOOKUPS = 1000
+
 class SNPListInput(BaseModel):
     snp_list: list[str]
-    threshold: float = 0.5
+    threshold: float | None = None
+    explain: bool = False
+    top_k: int = Field(5, ge=1)
+
+
+class LookupBatchInput(BaseModel):
+    snps: list[str] = Field(default_factory=list, max_length=MAX_BATCH_LOOKUPS)
+    genes: list[str] = Field(default_factory=list, max_length=MAX_BATCH_LOOKUPS)
+
+
+def require_index():
+    if gwas_index is None:
+        raise HTTPException(status_code=503, detail="GWAS index not available")
+    return gwas_index
 
 
+def require_model():
+    try:
+        wait_until_ready()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+# async so it runs on the event loop, not the threadpool where predict requests wait for the model
 @router.get("/health")
-def health():
-    return {"status": "healthy"}
+async def health():
+    load_error = model_loader.load_error
+    response = {
+        "status": "healthy" if load_error is None else "degraded",
+        "model_loaded": model_ready.is_set(),
+        "startup_mode": STARTUP_MODE,
+        "startup_timings": dict(startup_timings)
+    }
+    if load_error is not None:
+        response["model_error"] = str(load_error)
+    return response
 
 
 @router.post("/predict/list")
 def predict_from_list(data: SNPListInput):
-    features = prepare_features(data.snp_list)
-    predictions = predict_diseases(features, data.threshold)
+    require_model()
+    explanations = None
+    if data.explain:
+        probabilities, explanations = explain_diseases(data.snp_list, data.top_k)
+        predictions = format_predictions(probabilities, data.threshold)
+    else:
+        features = prepare_features(data.snp_list)
+        predictions = predict_diseases(features, data.threshold)
 
     detected = [d for d, v in predictions.items() if v["has_disease"]]
 
-    return {
+    response = {
         "predictions": predictions,
         "summary": {
             "total_snps_input": len(data.snp_list),
@@ -29,3 +71,31 @@ def predict_from_list(data: SNPListInput):
             "count": len(detected)
         }
     }
+    if explanations is not None:
+        response["explanations"] = explanations
+    return response
+
+
+@router.get("/snp/{snp_id}")
+def lookup_snp(snp_id: str):
+    result = require_index().lookup_snp(snp_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"SNP '{snp_id}' not found")
+    return result
+
+
+@router.get("/gene/{name}")
+def lookup_gene(name: str):
+    result = require_index().lookup_gene(name)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Gene '{name}' not found")
+    return result
+
+
+@router.post("/lookup/batch")
+def lookup_batch(data: LookupBatchInput):
+    index = require_index()
+    return {
+        "snps": {snp: index.lookup_snp(snp) for snp in data.snps},
+        "genes": {gene: index.lookup_gene(gene) for gene in data.genes}
+    }
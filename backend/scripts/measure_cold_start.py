@@ -0,0 +1,88 @@
+"""Measure time-to-first-prediction of the API from process start.
+
+Run from backend/:  python scripts/measure_cold_start.py --mode lazy --runs 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_REQUEST = {"snp_list": ["rs6947395-T", "rs327636-A"]}
+
+
+def request(url, payload=None, timeout=120):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def wait_for(url, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            return request(url, timeout=1)
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            time.sleep(0.02)
+    raise TimeoutError(f"{url} did not answer in time")
+
+
+def measure(mode, port, timeout):
+    # The server's own load wait matches ours, so a slow load shows up as a failed run, not a hang
+    env = dict(os.environ, STARTUP_MODE=mode, MODEL_LOAD_TIMEOUT=str(timeout))
+    base = f"http://127.0.0.1:{port}/api"
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = start + timeout
+        wait_for(f"{base}/health", deadline)
+        health_at = time.perf_counter() - start
+
+        try:
+            request(f"{base}/predict/list", SAMPLE_REQUEST, timeout=timeout)
+            first_at = time.perf_counter() - start
+
+            second = time.perf_counter()
+            request(f"{base}/predict/list", SAMPLE_REQUEST, timeout=timeout)
+            second_ms = (time.perf_counter() - second) * 1000
+            error = None
+        except urllib.error.HTTPError as e:
+            first_at = second_ms = None
+            error = f"HTTP {e.code}"
+
+        health = request(f"{base}/health")
+        timings = health.get("startup_timings", {})
+        if error and health.get("model_error"):
+            error = f"{error}: {health['model_error']}"
+    finally:
+        server.terminate()
+        server.wait()
+
+    return health_at, first_at, second_ms, timings, error
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure API time-to-first-prediction from process start")
+    parser.add_argument("--mode", choices=["eager", "lazy"], nargs="+", default=["eager", "lazy"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--timeout", type=float, default=180)
+    args = parser.parse_args()
+
+    print(f"{'mode':6} {'run':>3} {'health':>8} {'1st pred':>9} {'2nd pred':>9}  startup phases")
+    for mode in args.mode:
+        for run in range(1, args.runs + 1):
+            health_at, first_at, second_ms, timings, error = measure(mode, args.port, args.timeout)
+            if error:
+                print(f"{mode:6} {run:3d} {health_at:7.2f}s {'failed':>9} {'-':>9}  {error}")
+                continue
+            phases = ", ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items())
+            print(f"{mode:6} {run:3d} {health_at:7.2f}s {first_at:8.2f}s {second_ms:7.1f}ms  {phases}")
@@ -4,12 +4,25 @@ import logging
 from collections import defaultdict
 import warnings
 import os
+import argparse
+from disease_export import safe_disease_name, export_all_diseases
+from snp_overlap import (build_incidence_matrix, snp_totals, top_overlapping_pairs,
+                         write_top_k_pairs, write_overlap_graph)
 warnings.filterwarnings('ignore')
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+parser = argparse.ArgumentParser(description='GWAS analysis and per-disease dataset preparation')
+parser.add_argument('--export-all', action='store_true',
+                    help='export every trait as a partitioned parquet dataset instead of the top 5 CSVs')
+parser.add_argument('--export-dir', default='disease_datasets/all_traits',
+                    help='output directory for --export-all')
+parser.add_argument('--workers', type=int, default=None,
+                    help='parallel writers for --export-all (default: CPU count)')
+args = parser.parse_args()
+
 # Step 1: Load and clean data
 gwas_file = 'gwas_clean_data.csv'
 logger.info(f"Loading data from {gwas_file}...")
@@ -79,33 +92,22 @@ for i, (snp, diseases) in enumerate(list(multi_disease_snps.items())[:10]):
 # Step 4: Disease-SNP relationships
 logger.info("Disease-SNP relationships")
 
-disease_snp_counts = defaultdict(set)
-for _, row in df_clean.iterrows():
-    disease_snp_counts[row['DISEASE/TRAIT']].add(row['SNPS'])
-
-disease_pairs = []
-diseases_list = list(disease_snp_counts.keys())
-
-for i in range(len(diseases_list)):
-    for j in range(i+1, len(diseases_list)):
-        disease1 = diseases_list[i]
-        disease2 = diseases_list[j]
-        snps1 = disease_snp_counts[disease1]
-        snps2 = disease_snp_counts[disease2]
-        common_snps = snps1.intersection(snps2)
-        if common_snps:
-            disease_pairs.append({
-                'disease1': disease1,
-                'disease2': disease2,
-                'common_snps': len(common_snps),
-                'snps1_only': len(snps1 - snps2),
-                'snps2_only': len(snps2 - snps1)
-            })
-
-disease_pairs.sort(key=lambda x: x['common_snps'], reverse=True)
+overlap_dir = 'overlap_analysis'
+overlap_top_k = 10
+overlap_min_shared = 2
+
+incidence, diseases_list, _ = build_incidence_matrix(df_clean)
+_, unique_snps_per_disease = snp_totals(incidence)
+disease_index = {disease: i for i, disease in enumerate(diseases_list)}
+logger.info(f"Incidence matrix: {incidence.shape[0]} diseases x {incidence.shape[1]} SNPs ({incidence.nnz} links)")
+
 logger.info("\n Diseases sharing SNPs (top 10):")
-for pair in disease_pairs[:10]:
-    logger.info(f"  {pair['disease1'][:30]} & {pair['disease2'][:30]} → {pair['common_snps']} SNPs shared")
+for common, i, j in top_overlapping_pairs(incidence, n=10):
+    logger.info(f"  {diseases_list[i][:30]} & {diseases_list[j][:30]} → {common} SNPs shared")
+
+write_top_k_pairs(incidence, diseases_list, os.path.join(overlap_dir, 'top_overlap_pairs.csv'), k=overlap_top_k)
+write_overlap_graph(incidence, diseases_list, os.path.join(overlap_dir, 'overlap_graph.csv'),
+                    min_shared=overlap_min_shared)
 
 # Step 5: Analyze genes
 
@@ -137,11 +139,7 @@ logger.info(" Summary report")
 top_diseases = disease_counts.head(10)
 logger.info("\n Top diseases to focus on (by SNP count):")
 for disease, count in top_diseases.items():
-    disease_snps = set(df_clean[df_clean['DISEASE/TRAIT'] == disease]['SNPS'])
-    shared_count = sum(len(disease_snps.intersection(other_snps))
-                       for other_disease, other_snps in disease_snp_counts.items()
-                       if other_disease != disease)
-    unique_snps_count = count - shared_count
+    unique_snps_count = unique_snps_per_disease[disease_index[disease]]
     logger.info(f"  {disease[:40]:40} → {count:3d} SNPs ({unique_snps_count:3d} unique)")
 
 # Step 7: Create per-disease datasets
@@ -154,7 +152,7 @@ def create_disease_dataset(disease_name, output_dir='disease_datasets'):
         logger.error(f"Disease '{disease_name}' not found")
         return None
 
-    safe_name = disease_name.replace('/', '_').replace(' ', '_').replace('(', '').replace(')', '')
+    safe_name = safe_disease_name(disease_name)
     disease_file = os.path.join(output_dir, f"{safe_name}_data.csv")
     disease_data.to_csv(disease_file, index=False)
 
@@ -173,9 +171,12 @@ def create_disease_dataset(disease_name, output_dir='disease_datasets'):
     logger.info(f"Files created for '{disease_name}'")
     return disease_file
 
-top_5_diseases = disease_counts.head(5).index.tolist()
-for disease in top_5_diseases:
-    create_disease_dataset(disease)
+if args.export_all:
+    export_all_diseases(df_clean, output_dir=args.export_dir, workers=args.workers)
+else:
+    top_5_diseases = disease_counts.head(5).index.tolist()
+    for disease in top_5_diseases:
+        create_disease_dataset(disease)
 
 
 logger.info("GWAS data analysis completed successfully!")
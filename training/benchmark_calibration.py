@@ -0,0 +1,72 @@
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics import f1_score
+
+from calibration import choose_thresholds
+
+
+def make_heldout(n_patients, n_diseases, seed=42):
+    rng = np.random.default_rng(seed)
+    y_true = (rng.random((n_patients, n_diseases)) < 0.2).astype(np.int8)
+    y_proba = np.clip(0.4 * y_true + 0.6 * rng.random((n_patients, n_diseases)), 0, 1).astype(np.float32)
+    return y_true, y_proba
+
+
+# Baseline: one f1_score call per candidate threshold per disease
+def loop_thresholds(y_true, y_proba, candidates):
+    best = []
+    for i in range(y_true.shape[1]):
+        scores = [f1_score(y_true[:, i], y_proba[:, i] > t, zero_division=0) for t in candidates]
+        best.append(candidates[int(np.argmax(scores))])
+    return best
+
+
+# The stored metrics must describe the stored threshold under the backend's prob > threshold rule
+def check_thresholds(y_true, y_proba):
+    target_columns = [f"disease_{i}" for i in range(y_true.shape[1])]
+    thresholds, metrics = choose_thresholds(y_true, y_proba, target_columns)
+    for i, disease in enumerate(target_columns):
+        if disease not in metrics:
+            continue
+        actual = f1_score(y_true[:, i], y_proba[:, i] > thresholds[disease])
+        if not np.isclose(actual, metrics[disease]['f1']):
+            raise AssertionError(f"{disease}: recorded F1 {metrics[disease]['f1']:.4f}, "
+                                 f"F1 at threshold {thresholds[disease]} is {actual:.4f}")
+
+
+def run_benchmark(patient_counts, n_diseases, loop_limit):
+    candidates = np.linspace(0.01, 0.99, 99)
+    target_columns = [f"disease_{i}" for i in range(n_diseases)]
+
+    print(f"{'patients':>10} {'vectorized':>12} {'loop (99 thr)':>14}")
+    for n_patients in patient_counts:
+        y_true, y_proba = make_heldout(n_patients, n_diseases)
+
+        start = time.perf_counter()
+        choose_thresholds(y_true, y_proba, target_columns)
+        vectorized = time.perf_counter() - start
+
+        loop_text = '-'
+        if n_patients <= loop_limit:
+            start = time.perf_counter()
+            loop_thresholds(y_true, y_proba, candidates)
+            loop_text = f"{time.perf_counter() - start:.3f}s"
+
+        print(f"{n_patients:10d} {vectorized:11.3f}s {loop_text:>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark threshold calibration against the number of patients')
+    parser.add_argument('--patients', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--diseases', type=int, default=5)
+    parser.add_argument('--loop-limit', type=int, default=10000,
+                        help='skip the per-threshold loop baseline above this many patients')
+    args = parser.parse_args()
+
+    # Edge case: the best cut includes the lowest score, which is 0.0
+    check_thresholds(np.array([[1], [0], [1], [1]]), np.array([[0.0], [0.0], [0.6], [0.0]]))
+    check_thresholds(*make_heldout(5000, args.diseases))
+
+    run_benchmark(args.patients, args.diseases, args.loop_limit)
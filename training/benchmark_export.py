@@ -0,0 +1,51 @@
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from disease_export import export_all_diseases
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# Synthetic df_clean with the same columns as the analysis script
+def make_gwas_frame(n_traits, snps_per_trait=50, seed=42):
+    rng = np.random.default_rng(seed)
+    n_rows = n_traits * snps_per_trait
+    return pd.DataFrame({
+        'SNPS': [f"rs{i}" for i in rng.integers(1, 10_000_000, n_rows)],
+        'MAPPED_GENE': [f"GENE{i}" for i in rng.integers(1, 20_000, n_rows)],
+        'RISK_ALLELE_FREQUENCY': rng.random(n_rows),
+        'EFFECT_MIDPOINT': rng.random(n_rows) * 2,
+        'DISEASE/TRAIT': np.repeat([f"Trait {i}" for i in range(n_traits)], snps_per_trait)
+    })
+
+
+def run_benchmark(trait_counts, snps_per_trait, workers):
+    print(f"{'traits':>8} {'rows':>10} {'group':>8} {'write':>8} {'summary':>8} {'total':>8} {'traits/s':>10}")
+    for n_traits in trait_counts:
+        df_clean = make_gwas_frame(n_traits, snps_per_trait)
+        output_dir = tempfile.mkdtemp(prefix='export_bench_')
+        try:
+            start = time.perf_counter()
+            _, timings = export_all_diseases(df_clean, output_dir=output_dir, workers=workers)
+            total = time.perf_counter() - start
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        print(f"{n_traits:8d} {len(df_clean):10d} {timings['group']:8.2f} {timings['write_partitions']:8.2f} "
+              f"{timings['write_summary']:8.2f} {total:8.2f} {n_traits / total:10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark end-to-end export time against trait count')
+    parser.add_argument('--traits', type=int, nargs='+', default=[100, 1000, 5000, 20000])
+    parser.add_argument('--snps-per-trait', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    run_benchmark(args.traits, args.snps_per_trait, args.workers)
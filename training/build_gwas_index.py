@@ -0,0 +1,83 @@
+import argparse
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# MAPPED_GENE lists several genes as "A - B" or "A, B"; gene symbols themselves may contain '-'
+GENE_SEPARATOR = r'\s+-\s+|\s*[,;]\s*'
+
+
+# Same rule as compute_midpoint in analysisData&preparation.py, vectorized
+def compute_midpoints(ranges):
+    parts = ranges.astype(str).str.replace(' ', '').str.strip().str.extract(r'^([^-]*)-([^-]*)$')
+    low = pd.to_numeric(parts[0], errors='coerce')
+    high = pd.to_numeric(parts[1], errors='coerce')
+    return (low + high) / 2
+
+
+def load_associations(gwas_file):
+    df = pd.read_csv(gwas_file, low_memory=False)
+    df['EFFECT_MIDPOINT'] = compute_midpoints(df['EFFECT_SIZE_RANGE'])
+    df = df.dropna(subset=['EFFECT_MIDPOINT', 'RISK_ALLELE_FREQUENCY', 'SNPS', 'DISEASE/TRAIT'])
+    df = df[['SNPS', 'MAPPED_GENE', 'RISK_ALLELE_FREQUENCY', 'EFFECT_MIDPOINT', 'DISEASE/TRAIT']]
+    return df.reset_index(drop=True)
+
+
+# Sorted fixed-width keys plus CSR offsets, so a lookup is one binary search on the mmap
+def _sorted_keys(keys):
+    codes, uniques = pd.factorize(keys, sort=True)
+    counts = np.bincount(codes, minlength=len(uniques))
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return codes, np.array([key.encode('utf-8') for key in uniques], dtype=bytes), offsets
+
+
+def build_index(df, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Associations ordered by SNP
+    snp_codes, snp_keys, snp_offsets = _sorted_keys(df['SNPS'].astype(str))
+    order = np.argsort(snp_codes, kind='stable')
+    df = df.iloc[order].reset_index(drop=True)
+    snp_codes = snp_codes[order]
+
+    trait_codes, traits = pd.factorize(df['DISEASE/TRAIT'])
+
+    np.save(os.path.join(output_dir, 'snp_keys.npy'), snp_keys)
+    np.save(os.path.join(output_dir, 'snp_offsets.npy'), snp_offsets)
+    np.save(os.path.join(output_dir, 'assoc_snp.npy'), snp_codes.astype(np.int32))
+    np.save(os.path.join(output_dir, 'assoc_trait.npy'), trait_codes.astype(np.int32))
+    np.save(os.path.join(output_dir, 'assoc_effect.npy'), df['EFFECT_MIDPOINT'].to_numpy(np.float64))
+    np.save(os.path.join(output_dir, 'assoc_raf.npy'), df['RISK_ALLELE_FREQUENCY'].to_numpy(np.float64))
+
+    # Gene -> association rows
+    genes = (df['MAPPED_GENE'].dropna().astype(str)
+             .str.split(GENE_SEPARATOR, regex=True).explode().str.strip().str.upper())
+    genes = genes[genes != '']
+    gene_codes, gene_keys, gene_offsets = _sorted_keys(genes)
+    gene_order = np.argsort(gene_codes, kind='stable')
+
+    np.save(os.path.join(output_dir, 'gene_keys.npy'), gene_keys)
+    np.save(os.path.join(output_dir, 'gene_offsets.npy'), gene_offsets)
+    np.save(os.path.join(output_dir, 'gene_assoc.npy'), genes.index.to_numpy(np.int32)[gene_order])
+
+    with open(os.path.join(output_dir, 'traits.json'), 'w') as f:
+        json.dump(list(traits), f)
+
+    logger.info(f"Index written to {output_dir}: {len(snp_keys)} SNPs, {len(gene_keys)} genes, "
+                f"{len(traits)} traits, {len(df)} associations")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the memory-mapped SNP/gene lookup index for the backend')
+    parser.add_argument('--gwas-file', default='gwas_clean_data.csv')
+    parser.add_argument('--output', default='gwas_index')
+    args = parser.parse_args()
+
+    build_index(load_associations(args.gwas_file), args.output)
@@ -0,0 +1,91 @@
+import argparse
+
+import joblib
+import numpy as np
+
+
+def threshold_curves(y_true, y_proba):
+    """Precision/recall/F1 per disease at every candidate threshold, in one sorted pass.
+
+    Row k of each curve is the cut that labels the top k + 1 scores positive.
+    `valid` marks cuts that do not split a run of tied scores.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_proba = np.asarray(y_proba, dtype=np.float64)
+
+    order = np.argsort(-y_proba, axis=0, kind='stable')
+    scores = np.take_along_axis(y_proba, order, axis=0)
+    labels = np.take_along_axis(y_true, order, axis=0)
+
+    tp = np.cumsum(labels, axis=0)
+    predicted = np.arange(1, len(scores) + 1, dtype=np.float64)[:, None]
+    positives = tp[-1]
+
+    precision = tp / predicted
+    recall = tp / np.maximum(positives, 1)
+    f1 = 2 * tp / (predicted + positives)
+
+    valid = np.ones(scores.shape, dtype=bool)
+    valid[:-1] = scores[:-1] != scores[1:]
+
+    return scores, precision, recall, f1, valid
+
+
+def choose_thresholds(y_true, y_proba, target_columns, default=0.5):
+    """Pick the max-F1 threshold per disease; diseases with no positives keep `default`."""
+    scores, precision, recall, f1, valid = threshold_curves(y_true, y_proba)
+    best = np.argmax(np.where(valid, f1, -1), axis=0)
+    cols = np.arange(scores.shape[1])
+
+    # Predictions use prob > threshold, so cut halfway to the next lower score, and always strictly
+    # below the lowest score labelled positive (the last row has no next score; sigmoid outputs can
+    # be 0.0). Work in the probabilities' dtype so the cut survives float32 comparisons.
+    dtype = np.result_type(np.asarray(y_proba).dtype, np.float32)
+    cut_scores = scores[best, cols].astype(dtype)
+    below_cut = np.nextafter(cut_scores, dtype.type(-np.inf))
+    next_scores = np.append(scores.astype(dtype), below_cut[None, :], axis=0)[best + 1, cols]
+    midpoints = ((cut_scores.astype(np.float64) + next_scores) / 2).astype(dtype)
+    thresholds = np.where(midpoints < cut_scores, midpoints, below_cut)
+    has_positives = np.asarray(y_true).sum(axis=0) > 0
+
+    chosen, metrics = {}, {}
+    for i, disease in enumerate(target_columns):
+        if not has_positives[i]:
+            chosen[disease] = default
+            continue
+        chosen[disease] = float(thresholds[i])
+        metrics[disease] = {
+            'precision': float(precision[best[i], i]),
+            'recall': float(recall[best[i], i]),
+            'f1': float(f1[best[i], i])
+        }
+
+    return chosen, metrics
+
+
+def calibrate_model_info(model_info, y_true, y_proba):
+    thresholds, metrics = choose_thresholds(y_true, y_proba, model_info['target_columns'],
+                                            default=model_info.get('threshold', 0.5))
+    model_info['thresholds'] = thresholds
+    model_info['calibration'] = metrics
+    return model_info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Choose per-disease thresholds from calibration-split predictions')
+    parser.add_argument('--predictions', default='calibration_predictions.npz',
+                        help='npz with y_true and y_proba arrays (written by model.py); '
+                             'do not use the set you report test metrics on')
+    parser.add_argument('--model-info', default='model_info.pkl')
+    args = parser.parse_args()
+
+    calibration = np.load(args.predictions)
+    model_info = calibrate_model_info(joblib.load(args.model_info), calibration['y_true'], calibration['y_proba'])
+    joblib.dump(model_info, args.model_info)
+
+    print("Per-disease thresholds:")
+    for disease, threshold in model_info['thresholds'].items():
+        f1 = model_info['calibration'].get(disease, {}).get('f1')
+        f1_text = f"F1 {f1 * 100:.2f}%" if f1 is not None else "no positives, default kept"
+        print(f"  • {disease[:40]:40} {threshold:.3f}  ({f1_text})")
+    print(f"Model info updated: {args.model_info}")
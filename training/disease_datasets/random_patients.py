@@ -6,22 +6,20 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = BASE_DIR
 
-print(f"[INFO] Script directory: {BASE_DIR}")
-print(f"[INFO] Loading CSV files from: {DATA_DIR}")
+# Per-disease files produced by analysisData&preparation.py (also read by training/pipeline.py)
+DISEASE_FILES = [
+    'Type_2_diabetes_data.csv',
+    'Glaucoma_primary_open-angle_data.csv',
+    'Non-glioblastoma_glioma_data.csv',
+    'Endometriosis_data.csv',
+    'Suicide_attempts_in_major_depressive_disorder_or_bipolar_disorder_or_schizophrenia_data.csv'
+]
 
 # STEP 1: Load all disease datasets
 def load_all_disease_data():
     diseases = {}
 
-    files = [
-        'Type_2_diabetes_data.csv',
-        'Glaucoma_primary_open-angle_data.csv',
-        'Non-glioblastoma_glioma_data.csv',
-        'Endometriosis_data.csv',
-        'Suicide_attempts_in_major_depressive_disorder_or_bipolar_disorder_or_schizophrenia_data.csv'
-    ]
-
-    for file in files:
+    for file in DISEASE_FILES:
         path = os.path.join(DATA_DIR, file)
 
         # --- safety check: file must exist ---
@@ -108,6 +106,8 @@ def save_synthetic_data(patients, disease_labels):
 
 # MAIN EXECUTION
 if __name__ == "__main__":
+    print(f"[INFO] Script directory: {BASE_DIR}")
+    print(f"[INFO] Loading CSV files from: {DATA_DIR}")
 
     print("Loading disease data...")
     diseases = load_all_disease_data()
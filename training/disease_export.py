@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COL = 'trait'
+# Leading underscore: pyarrow/pandas dataset readers skip it, so the export loads as a dataset
+SUMMARY_FILE = '_disease_summary.csv'
+MAX_PARTITION_NAME = 80
+
+
+def safe_disease_name(disease_name):
+    return disease_name.replace('/', '_').replace(' ', '_').replace('(', '').replace(')', '')
+
+
+# safe_disease_name is lossy ("A/B" and "A_B" collide) and unbounded, so the partition key
+# is a truncated safe name plus a hash of the full trait name
+def partition_key(disease_name):
+    digest = hashlib.sha1(disease_name.encode('utf-8')).hexdigest()[:12]
+    return f"{safe_disease_name(disease_name)[:MAX_PARTITION_NAME]}-{digest}"
+
+
+def partition_keys(diseases):
+    keys = {disease: partition_key(disease) for disease in diseases}
+    if len(set(keys.values())) != len(keys):
+        raise ValueError("Partition key collision between trait names")
+    return keys
+
+
+# Per-trait summary stats for every disease in one groupby pass
+def summarize_diseases(df_clean, keys=None):
+    grouped = df_clean.groupby('DISEASE/TRAIT', sort=False)
+    summary = grouped.agg(
+        snp_count=('SNPS', 'size'),
+        avg_risk_allele_frequency=('RISK_ALLELE_FREQUENCY', 'mean'),
+        avg_effect_size=('EFFECT_MIDPOINT', 'mean')
+    )
+    top_idx = grouped['EFFECT_MIDPOINT'].idxmax()
+    summary['top_snp'] = df_clean.loc[top_idx.values, 'SNPS'].values
+    summary.index.name = 'disease'
+    summary = summary.reset_index()
+    keys = keys or partition_keys(summary['disease'])
+    summary.insert(1, PARTITION_COL, summary['disease'].map(keys))
+    return summary
+
+
+def _write_partition(output_dir, partition, disease_data):
+    partition_dir = os.path.join(output_dir, f"{PARTITION_COL}={partition}")
+    os.makedirs(partition_dir, exist_ok=True)
+    disease_data.to_parquet(os.path.join(partition_dir, 'part-0.parquet'), index=False)
+    return len(disease_data)
+
+
+# Group once and write one parquet partition per trait, in parallel
+def export_all_diseases(df_clean, output_dir='disease_datasets/all_traits', workers=None):
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    timings = {}
+
+    start = time.perf_counter()
+    groups = list(df_clean.groupby('DISEASE/TRAIT', sort=False))
+    keys = partition_keys([disease for disease, _ in groups])
+    timings['group'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_write_partition, output_dir, keys[disease], disease_data)
+            for disease, disease_data in groups
+        ]
+        n_rows = sum(future.result() for future in futures)
+    timings['write_partitions'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summary = summarize_diseases(df_clean, keys)
+    summary.to_csv(os.path.join(output_dir, SUMMARY_FILE), index=False)
+    timings['write_summary'] = time.perf_counter() - start
+
+    logger.info(f"Exported {len(futures)} diseases ({n_rows} rows) to {output_dir} "
+                f"with {workers} workers")
+    for stage, seconds in timings.items():
+        logger.info(f"  {stage:18} {seconds:8.3f}s")
+
+    return summary, timings
+
+
+# Read back one or more traits from the partitioned dataset, resolving names through the summary
+def load_disease_partitions(output_dir, diseases=None):
+    summary = pd.read_csv(os.path.join(output_dir, SUMMARY_FILE), usecols=['disease', PARTITION_COL])
+    keys = dict(zip(summary['disease'], summary[PARTITION_COL]))
+
+    if diseases is None:
+        partitions = list(keys.values())
+    else:
+        unknown = [disease for disease in diseases if disease not in keys]
+        if unknown:
+            raise KeyError(f"Disease not in {SUMMARY_FILE}: {unknown[0]}")
+        partitions = [keys[disease] for disease in diseases]
+
+    frames = []
+    for partition in partitions:
+        path = os.path.join(output_dir, f"{PARTITION_COL}={partition}", 'part-0.parquet')
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Missing partition: {path}")
+        frames.append(pd.read_parquet(path))
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
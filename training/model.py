@@ -3,7 +3,9 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import f1_score
 import pandas as pd
+import numpy as np
 import joblib
+from calibration import calibrate_model_info
 
 # 1. Load data
 df = pd.read_csv('synthetic_patients_data.csv')
@@ -20,11 +22,17 @@ X_train, X_test, y_train, y_test = train_test_split(
     X, y, test_size=0.2, random_state=42
 )
 
+# Calibration split for the per-disease thresholds, kept apart from the reported test set
+X_train, X_cal, y_train, y_cal = train_test_split(
+    X_train, y_train, test_size=0.15, random_state=42
+)
+
 # 3 . Scaling
 print("\n Scaling input data...")
 scaler = StandardScaler()
 X_train_scaled = scaler.fit_transform(X_train)
 X_test_scaled = scaler.transform(X_test)
+X_cal_scaled = scaler.transform(X_cal)
 
 # Save the scaler for later use
 scaler_path = 'disease_scaler.pkl'
@@ -123,6 +131,12 @@ y_pred = (y_pred_proba > 0.5).astype(int)
 # Calculate F1 score
 f1 = f1_score(y_test, y_pred, average='weighted')
 
+# Calibration-split probabilities, also kept so thresholds can be recalibrated with calibration.py
+y_cal_proba = model.predict(X_cal_scaled, verbose=0)
+calibration_path = 'calibration_predictions.npz'
+np.savez_compressed(calibration_path, y_true=y_cal.to_numpy(), y_proba=y_cal_proba)
+print(f"Calibration predictions saved as: {calibration_path}")
+
 # 9. Save the final model
 print("\n Saving model ...")
 
@@ -140,6 +154,11 @@ model_info = {
     'threshold': 0.5
 }
 
+# Per-disease thresholds (max F1 on the calibration split), scored on the untouched test set
+model_info = calibrate_model_info(model_info, y_cal.to_numpy(), y_cal_proba)
+thresholds = np.array([model_info['thresholds'][d] for d in target_cols])
+f1_calibrated = f1_score(y_test, (y_pred_proba > thresholds).astype(int), average='weighted')
+
 model_info_path = 'model_info.pkl'
 joblib.dump(model_info, model_info_path)
 print(f" Model info saved as: {model_info_path}")
@@ -151,7 +170,7 @@ print("\n Model training complete!")
 print("MODEL SUMMARY")
 print(f"""Model Performance:
   • Accuracy:  {test_acc * 100:.2f}%
-  • F1 Score:  {f1 * 100:.2f}%
+  • F1 Score:  {f1 * 100:.2f}% (0.5 threshold), {f1_calibrated * 100:.2f}% (per-disease thresholds)
   • Precision: {test_precision * 100:.2f}%
   • Recall:    {test_recall * 100:.2f}%
 """)
\ No newline at end of file
@@ -1,7 +1,17 @@
 import pandas as pd
+import numpy as np
 from tensorflow import keras
 import joblib
+import argparse
+import json
 import os
+import re
+import time
+import warnings
+from collections import OrderedDict
+
+# The scaler was fitted on a DataFrame; we feed it plain arrays
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
 
 print("DISEASE PREDICTION MODEL - TEST ")
 
@@ -33,9 +43,16 @@ def load_model_artifacts():
 
 # Load everything
 model, scaler, model_info = load_model_artifacts()
+feature_index = {snp: i for i, snp in enumerate(model_info['feature_columns'])}
+
+# Per-disease thresholds from calibration.py (global threshold for older model_info files)
+disease_thresholds = np.array([
+    model_info.get('thresholds', {}).get(disease, model_info['threshold'])
+    for disease in model_info['target_columns']
+])
 
 # PREDICTION FUNCTION
-def predict_disease_risk(patient_snps, threshold=0.5):
+def predict_disease_risk(patient_snps, threshold=None):
 
     # Convert input to dictionary if it's a list
     if isinstance(patient_snps, list):
@@ -43,13 +60,11 @@ def predict_disease_risk(patient_snps, threshold=0.5):
     else:
         patient_dict = patient_snps
 
-    # Create feature vector with zeros
-    features = pd.DataFrame(0, index=[0], columns=model_info['feature_columns'])
-
-    # Fill in the patient's SNPs
+    # Create feature vector with zeros and fill in the patient's SNPs
+    features = np.zeros((1, len(feature_index)), dtype=np.float32)
     for snp, value in patient_dict.items():
-        if snp in features.columns:
-            features.loc[0, snp] = value
+        if snp in feature_index:
+            features[0, feature_index[snp]] = value
         else:
             print(f" Warning: SNP '{snp}' not recognized by model")
 
@@ -63,20 +78,22 @@ def predict_disease_risk(patient_snps, threshold=0.5):
     results = {}
     for i, disease in enumerate(model_info['target_columns']):
         prob = float(predictions[0, i])
+        disease_threshold = float(disease_thresholds[i]) if threshold is None else threshold
 
-        # Determine risk level
-        if prob > 0.7:
+        # Determine risk level (bands scale with the disease threshold; 0.3/0.5/0.7 at 0.5)
+        t = float(disease_thresholds[i])
+        if prob > t + 0.4 * (1 - t):
             risk_level = " HIGH RISK"
-        elif prob > 0.5:
+        elif prob > t:
             risk_level = " MEDIUM RISK"
-        elif prob > 0.3:
+        elif prob > 0.6 * t:
             risk_level = " LOW RISK"
         else:
             risk_level = " VERY LOW RISK"
 
         results[disease] = {
             'probability': prob,
-            'has_disease': prob > threshold,
+            'has_disease': prob > disease_threshold,
             'risk_level': risk_level,
             'percentage': f"{prob * 100:.1f}%"
         }
@@ -124,11 +141,22 @@ def print_predictions(results, patient_snps=None):
 
     # Top recommendations
     print(f"\n RECOMMENDATIONS:")
-    high_risk_diseases = [d for d, info in results.items() if info['probability'] > 0.3]
+    # Anything above VERY LOW on the disease's own risk bands (0.3 when the threshold is 0.5)
+    high_risk_diseases = [d for d, info in sorted_results if info['risk_level'].strip() != 'VERY LOW RISK']
     for disease in high_risk_diseases[:2]:  # Top 2 highest risks
         simple_name = disease.split('(')[0].strip() if '(' in disease else disease
         print(f"   • Consider screening for {simple_name}")
 
+def print_explanations(explanations, results):
+    print("\n TOP CONTRIBUTING SNPs:")
+    for disease, info in sorted(results.items(), key=lambda x: x[1]['probability'], reverse=True):
+        contributions = explanations.get(disease, [])
+        if not contributions:
+            continue
+        display_name = disease[:35] + "..." if len(disease) > 35 else disease
+        snps_text = ", ".join(f"{c['snp']} ({c['contribution'] * 100:+.1f}%)" for c in contributions)
+        print(f"   • {display_name}: {snps_text}")
+
 # PRE-DEFINED TEST CASES
 def run_test_cases():
     print("PRE-DEFINED TEST CASES")
@@ -187,6 +215,7 @@ def interactive_test():
                 print(f"\nAnalyzing {len(snps_list)} SNPs...")
                 results = predict_disease_risk(snps_list)
                 print_predictions(results, snps_list)
+                print_explanations(explain_disease_risk(snps_list, top_k=3), results)
             else:
                 print("No SNPs entered!")
 
@@ -201,9 +230,214 @@ def interactive_test():
             print("Invalid choice! Please enter 1, 2, or 3")
 
 
+# BATCH FILE SCORING
+
+def read_patient_file(path):
+    """Return a list of (patient_id, snp_list) from a .csv, .jsonl or blank-line-separated .txt file."""
+    ext = os.path.splitext(path)[1].lower()
+    patients = []
+
+    if ext == '.csv':
+        try:
+            df = pd.read_csv(path, dtype=str).fillna('')
+        except pd.errors.EmptyDataError:
+            return patients
+        if 'snps' not in df.columns:
+            raise ValueError(f"{path}: expected columns 'patient_id' (optional) and 'snps', "
+                             f"found {list(df.columns)}")
+        for i, row in enumerate(df.itertuples(index=False)):
+            row = row._asdict()
+            patient_id = row.get('patient_id') or f"patient_{i + 1}"
+            snps = row.get('snps', '').replace(',', ';').replace(' ', ';').split(';')
+            patients.append((patient_id, [snp for snp in snps if snp]))
+
+    elif ext == '.jsonl':
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                patients.append((record.get('patient_id') or f"patient_{len(patients) + 1}",
+                                 record['snp_list']))
+
+    else:
+        with open(path) as f:
+            groups = re.split(r'\n\s*\n', f.read())
+        for group in groups:
+            snps = [line.strip() for line in group.splitlines() if line.strip()]
+            if snps:
+                patients.append((f"patient_{len(patients) + 1}", snps))
+
+    return patients
+
+
+def encode_patients(patients):
+    """Encode every patient into one (n_patients, n_features) binary matrix."""
+    rows, cols = [], []
+    unrecognized = np.zeros(len(patients), dtype=np.int32)
+
+    for row, (_, snps) in enumerate(patients):
+        for snp in snps:
+            col = feature_index.get(snp)
+            if col is None:
+                unrecognized[row] += 1
+            else:
+                rows.append(row)
+                cols.append(col)
+
+    features = np.zeros((len(patients), len(feature_index)), dtype=np.float32)
+    features[rows, cols] = 1
+    return features, unrecognized
+
+
+# Canonical (sorted, recognised) SNP set -> occlusion deltas, least recently used evicted first
+EXPLANATION_CACHE_SIZE = 10000
+explanation_cache = OrderedDict()
+
+
+def _occlusion_chunk(chunk_keys, batch_size):
+    n_rows = sum(len(key) + 1 for key in chunk_keys)
+    batch = np.zeros((n_rows, len(feature_index)), dtype=np.float32)
+    starts = []
+    row = 0
+    for key in chunk_keys:
+        cols = [feature_index[snp] for snp in key]
+        batch[row:row + len(key) + 1, cols] = 1
+        batch[np.arange(row + 1, row + len(key) + 1), cols] = 0
+        starts.append(row)
+        row += len(key) + 1
+
+    probs = model.predict(scaler.transform(batch), batch_size=batch_size, verbose=0)
+    deltas = {}
+    for key, start in zip(chunk_keys, starts):
+        deltas[key] = probs[start] - probs[start + 1:start + len(key) + 1]
+        explanation_cache[key] = deltas[key]
+        explanation_cache.move_to_end(key)
+    while len(explanation_cache) > EXPLANATION_CACHE_SIZE:
+        explanation_cache.popitem(last=False)
+    return deltas
+
+
+def explain_patients(patients, top_k=5, batch_size=4096):
+    """Top contributing SNPs per disease for every patient, by occlusion.
+
+    The patient row and one row per dropped SNP are stacked for uncached
+    SNP sets and scored in batched predict calls of about batch_size rows,
+    so memory stays bounded however large the cohort is.
+    """
+    target_columns = model_info['target_columns']
+    keys = [tuple(sorted({snp for snp in snps if snp in feature_index})) for _, snps in patients]
+
+    # Only the top_k summary per SNP set is kept for this call; the deltas live in the bounded cache
+    summaries = {}
+
+    def summarize(key, deltas):
+        order = np.argsort(-np.abs(deltas), axis=0)[:top_k]
+        summaries[key] = {
+            disease: [{'snp': key[j], 'contribution': float(deltas[j, i])} for j in order[:, i]]
+            for i, disease in enumerate(target_columns)
+        }
+
+    chunk, chunk_rows = [], 0
+    for key in dict.fromkeys(keys):
+        if not key:
+            summaries[key] = {disease: [] for disease in target_columns}
+        elif key in explanation_cache:
+            explanation_cache.move_to_end(key)
+            summarize(key, explanation_cache[key])
+        else:
+            chunk.append(key)
+            chunk_rows += len(key) + 1
+            if chunk_rows >= batch_size:
+                for done, deltas in _occlusion_chunk(chunk, batch_size).items():
+                    summarize(done, deltas)
+                chunk, chunk_rows = [], 0
+
+    if chunk:
+        for done, deltas in _occlusion_chunk(chunk, batch_size).items():
+            summarize(done, deltas)
+
+    return [summaries[key] for key in keys]
+
+
+def explain_disease_risk(patient_snps, top_k=5):
+    return explain_patients([(None, patient_snps)], top_k)[0]
+
+
+def write_batch_results(path, fmt, patients, probabilities, unrecognized, threshold, explanations=None):
+    target_columns = model_info['target_columns']
+    detected = probabilities > (disease_thresholds if threshold is None else threshold)
+
+    if fmt == 'csv':
+        results = pd.DataFrame(probabilities, columns=target_columns)
+        results.insert(0, 'patient_id', [patient_id for patient_id, _ in patients])
+        results.insert(1, 'total_snps', [len(snps) for _, snps in patients])
+        results.insert(2, 'unrecognized_snps', unrecognized)
+        results['diseases_detected'] = ['; '.join(np.asarray(target_columns)[row]) for row in detected]
+        if explanations is not None:
+            results['explanations'] = [json.dumps(explanation) for explanation in explanations]
+        results.to_csv(path, index=False)
+    else:
+        with open(path, 'w') as f:
+            for i, (patient_id, snps) in enumerate(patients):
+                record = {
+                    'patient_id': patient_id,
+                    'total_snps': len(snps),
+                    'unrecognized_snps': int(unrecognized[i]),
+                    'predictions': dict(zip(target_columns, probabilities[i].tolist())),
+                    'diseases_detected': [d for d, hit in zip(target_columns, detected[i]) if hit]
+                }
+                if explanations is not None:
+                    record['explanations'] = explanations[i]
+                f.write(json.dumps(record) + '\n')
+
+
+def score_file(input_path, output_path, fmt=None, threshold=None, batch_size=4096, explain=False, top_k=5):
+    fmt = fmt or ('jsonl' if output_path.endswith('.jsonl') else 'csv')
+    timings = {}
+
+    start = time.perf_counter()
+    patients = read_patient_file(input_path)
+    timings['read'] = time.perf_counter() - start
+
+    if not patients:
+        print(f"\nNo patients found in {input_path}; nothing to score.")
+        return timings
+
+    start = time.perf_counter()
+    features, unrecognized = encode_patients(patients)
+    timings['encode'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features_scaled = scaler.transform(features)
+    timings['scale'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    probabilities = model.predict(features_scaled, batch_size=batch_size, verbose=0)
+    timings['predict'] = time.perf_counter() - start
+
+    explanations = None
+    if explain:
+        start = time.perf_counter()
+        explanations = explain_patients(patients, top_k, batch_size)
+        timings['explain'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    write_batch_results(output_path, fmt, patients, probabilities, unrecognized, threshold, explanations)
+    timings['write'] = time.perf_counter() - start
+
+    total = sum(timings.values())
+    print(f"\nScored {len(patients)} patients -> {output_path} ({fmt})")
+    for stage, seconds in timings.items():
+        print(f"  {stage:8} {seconds:8.3f}s")
+    print(f"  {'total':8} {total:8.3f}s  ({len(patients) / total if total else 0:.1f} patients/sec)")
+
+    return timings
+
+
 # SINGLE PATIENT TEST (Simple Function)
 
-def quick_test(snp_list):
+def quick_test(snp_list, explain=False, top_k=5):
     results = predict_disease_risk(snp_list)
 
     # Simple output format
@@ -214,10 +448,12 @@ def quick_test(snp_list):
             'diseases_detected': sum(1 for info in results.values() if info['has_disease']),
             'high_risk_diseases': [
                 disease for disease, info in results.items()
-                if info['probability'] > 0.7
+                if info['risk_level'].strip() == 'HIGH RISK'
             ]
         }
     }
+    if explain:
+        output['explanations'] = explain_disease_risk(snp_list, top_k)
 
     return output
 
@@ -225,6 +461,25 @@ def quick_test(snp_list):
 # MAIN EXECUTION
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Test the disease prediction model')
+    parser.add_argument('--score', metavar='FILE',
+                        help='score a .csv (patient_id,snps), .jsonl (patient_id,snp_list) '
+                             'or blank-line-separated .txt file non-interactively')
+    parser.add_argument('--output', default='predictions.csv', help='results file for --score')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='output format (default: from --output)')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='override the per-disease thresholds stored in model_info')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--explain', action='store_true',
+                        help='add the top contributing SNPs per disease (occlusion) to each result')
+    parser.add_argument('--top-k', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.score:
+        score_file(args.score, args.output, args.format, args.threshold, args.batch_size,
+                   args.explain, args.top_k)
+        raise SystemExit(0)
+
     print("\n" + "=" * 60)
     print("MODEL INFORMATION")
     print("=" * 60)
@@ -233,6 +488,8 @@ if __name__ == "__main__":
     print(f"  • Input features: {model_info['input_shape']} SNPs")
     print(f"  • Output diseases: {model_info['output_shape']}")
     print(f"  • Prediction threshold: {model_info['threshold']}")
+    for disease, threshold in model_info.get('thresholds', {}).items():
+        print(f"      {disease[:40]:40} {threshold:.3f}")
 
     print(f"\nAvailable Diseases:")
     for i, disease in enumerate(model_info['target_columns'], 1):
@@ -0,0 +1,249 @@
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, 'disease_datasets')
+BACKEND_MODELS_DIR = os.path.join(BASE_DIR, '..', 'backend', 'models')
+CACHE_FILE = os.path.join(BASE_DIR, '.pipeline_cache.json')
+RUN_LOG = os.path.join(BASE_DIR, 'pipeline_runs.jsonl')
+
+
+def _load_disease_files():
+    # Same list random_patients.py reads, so the stage declarations can't drift from it
+    spec = importlib.util.spec_from_file_location('random_patients', os.path.join(DATA_DIR, 'random_patients.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.DISEASE_FILES
+
+
+DISEASE_FILES = _load_disease_files()
+MODEL_FILES = ['best_disease_model.keras', 'disease_scaler.pkl', 'model_info.pkl']
+
+
+def _training(*parts):
+    return os.path.join(BASE_DIR, *parts)
+
+
+def _data(*parts):
+    return os.path.join(DATA_DIR, *parts)
+
+
+def publish_models(stage):
+    os.makedirs(BACKEND_MODELS_DIR, exist_ok=True)
+    for name in MODEL_FILES:
+        shutil.copy2(_data(name), os.path.join(BACKEND_MODELS_DIR, name))
+
+    index_dir = os.path.join(BACKEND_MODELS_DIR, 'gwas_index')
+    shutil.rmtree(index_dir, ignore_errors=True)
+    shutil.copytree(_training('gwas_index'), index_dir)
+
+
+# Each stage: a command (or callable) plus the files it reads and writes.
+# Dependencies are inferred by matching one stage's inputs to another's outputs.
+STAGES = [
+    {
+        'name': 'analysis',
+        'cmd': [sys.executable, 'analysisData&preparation.py'],
+        'cwd': BASE_DIR,
+        'params': {},
+        'inputs': [_training('gwas_clean_data.csv'), _training('analysisData&preparation.py'),
+                   _training('snp_overlap.py'), _training('disease_export.py')],
+        'outputs': [_data(name) for name in DISEASE_FILES]
+    },
+    {
+        'name': 'gwas_index',
+        'cmd': [sys.executable, 'build_gwas_index.py', '--output', 'gwas_index'],
+        'cwd': BASE_DIR,
+        'params': {},
+        'inputs': [_training('gwas_clean_data.csv'), _training('build_gwas_index.py')],
+        'outputs': [_training('gwas_index')]
+    },
+    {
+        'name': 'synthetic_patients',
+        'cmd': [sys.executable, 'random_patients.py'],
+        'cwd': DATA_DIR,
+        'params': {},
+        'inputs': [_data(name) for name in DISEASE_FILES] + [_data('random_patients.py')],
+        'outputs': [_data('synthetic_patients_data.csv')]
+    },
+    {
+        'name': 'train',
+        'cmd': [sys.executable, os.path.join('..', 'model.py')],
+        'cwd': DATA_DIR,
+        'params': {},
+        'inputs': [_data('synthetic_patients_data.csv'), _training('model.py'), _training('calibration.py')],
+        'outputs': [_data(name) for name in MODEL_FILES]
+    },
+    {
+        'name': 'publish',
+        'func': publish_models,
+        'params': {},
+        'inputs': [_data(name) for name in MODEL_FILES] + [_training('gwas_index')],
+        'outputs': [os.path.join(BACKEND_MODELS_DIR, name) for name in MODEL_FILES]
+                   + [os.path.join(BACKEND_MODELS_DIR, 'gwas_index')]
+    }
+]
+
+
+def hash_path(path, digest):
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                hash_path(file_path, digest)
+        return
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+
+
+def stage_key(stage):
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        'cmd': stage.get('cmd'),
+        'func': stage['func'].__name__ if 'func' in stage else None,
+        'params': stage['params']
+    }, sort_keys=True).encode())
+    for path in stage['inputs']:
+        digest.update(os.path.relpath(path, BASE_DIR).encode())
+        hash_path(path, digest)
+    return digest.hexdigest()
+
+
+def outputs_hash(stage):
+    digest = hashlib.sha256()
+    for path in stage['outputs']:
+        digest.update(os.path.relpath(path, BASE_DIR).encode())
+        hash_path(path, digest)
+    return digest.hexdigest()
+
+
+def stage_dependencies(stages):
+    producers = {os.path.normpath(out): stage['name'] for stage in stages for out in stage['outputs']}
+    return {
+        stage['name']: {producers[os.path.normpath(path)] for path in stage['inputs']
+                        if os.path.normpath(path) in producers}
+        for stage in stages
+    }
+
+
+class StageFailed(Exception):
+    def __init__(self, message, seconds):
+        super().__init__(message)
+        self.seconds = seconds
+
+
+def run_stage(stage, cache, force):
+    start = time.perf_counter()
+    try:
+        return _run_stage(stage, cache, force, start)
+    except Exception as e:
+        raise StageFailed(str(e), time.perf_counter() - start) from e
+
+
+def _run_stage(stage, cache, force, start):
+    missing = [path for path in stage['inputs'] if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"[ERROR] Missing input for '{stage['name']}': {missing[0]}")
+
+    key = stage_key(stage)
+    entry = cache.get(stage['name'])
+    # Cache hit only if inputs are unchanged and the outputs are byte-for-byte what that run wrote
+    if (not force and isinstance(entry, dict) and entry.get('key') == key
+            and all(os.path.exists(path) for path in stage['outputs'])
+            and entry.get('outputs') == outputs_hash(stage)):
+        return 'cached', entry, time.perf_counter() - start
+
+    if 'func' in stage:
+        stage['func'](stage)
+    else:
+        cmd = stage['cmd'] + [str(arg) for arg in stage['params'].get('args', [])]
+        subprocess.run(cmd, cwd=stage['cwd'], check=True)
+
+    missing = [path for path in stage['outputs'] if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"[ERROR] Stage '{stage['name']}' did not write: {missing[0]}")
+
+    return 'ran', {'key': key, 'outputs': outputs_hash(stage)}, time.perf_counter() - start
+
+
+def run_pipeline(stages, workers=2, force=False):
+    cache = {}
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+
+    run_id = uuid.uuid4().hex[:8]
+    deps = stage_dependencies(stages)
+    by_name = {stage['name']: stage for stage in stages}
+    status = {}
+    pending = set(by_name)
+    running = {}
+
+    def log(name, state, seconds, key=None, error=None):
+        status[name] = state
+        record = {'run_id': run_id, 'stage': name, 'status': state, 'seconds': round(seconds, 3),
+                  'key': key, 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        if error:
+            record['error'] = error
+        with open(RUN_LOG, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        print(f"[INFO] {name:20} {state:8} {seconds:8.2f}s")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for name in sorted(pending):
+                if any(status.get(dep) in ('failed', 'skipped') for dep in deps[name]):
+                    pending.discard(name)
+                    log(name, 'skipped', 0.0)
+                elif all(status.get(dep) in ('ran', 'cached') for dep in deps[name]):
+                    pending.discard(name)
+                    running[executor.submit(run_stage, by_name[name], cache, force)] = name
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    state, entry, seconds = future.result()
+                except StageFailed as e:
+                    # Outputs may be half-written; never let them pass as cached later
+                    cache.pop(name, None)
+                    log(name, 'failed', e.seconds, error=str(e))
+                    continue
+                cache[name] = entry
+                log(name, state, seconds, entry['key'])
+
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the training pipeline, skipping unchanged stages')
+    parser.add_argument('--stages', nargs='+', choices=[stage['name'] for stage in STAGES],
+                        help='run only these stages (their inputs must already exist)')
+    parser.add_argument('--force', action='store_true', help='ignore the cache and rerun every stage')
+    parser.add_argument('--workers', type=int, default=2, help='stages to run in parallel')
+    args = parser.parse_args()
+
+    stages = [stage for stage in STAGES if not args.stages or stage['name'] in args.stages]
+    status = run_pipeline(stages, workers=args.workers, force=args.force)
+
+    failed = [name for name, state in status.items() if state == 'failed']
+    print(f"[INFO] Run log: {RUN_LOG}")
+    sys.exit(1 if failed else 0)
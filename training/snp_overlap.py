@@ -0,0 +1,146 @@
+import heapq
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+# Build a disease x SNP binary incidence matrix (CSR)
+def build_incidence_matrix(df, disease_col='DISEASE/TRAIT', snp_col='SNPS'):
+    pairs = df[[disease_col, snp_col]].dropna().drop_duplicates()
+
+    disease_codes, diseases = pd.factorize(pairs[disease_col])
+    snp_codes, snps = pd.factorize(pairs[snp_col])
+
+    data = np.ones(len(pairs), dtype=np.int32)
+    incidence = sparse.csr_matrix(
+        (data, (disease_codes, snp_codes)),
+        shape=(len(diseases), len(snps))
+    )
+    incidence.sort_indices()
+
+    return incidence, list(diseases), list(snps)
+
+
+# Distinct SNPs per disease and SNPs found in no other disease
+def snp_totals(incidence):
+    snp_degree = np.asarray(incidence.sum(axis=0)).ravel()
+    total = np.asarray(incidence.sum(axis=1)).ravel()
+    unique = incidence @ (snp_degree == 1).astype(np.int32)
+    return total, np.asarray(unique).ravel()
+
+
+# Yield shared-SNP counts one row block at a time; never builds the dense D x D matrix
+def iter_overlap_blocks(incidence, block_size=2048):
+    incidence_t = incidence.T.tocsc()
+    n_diseases = incidence.shape[0]
+
+    for start in range(0, n_diseases, block_size):
+        stop = min(start + block_size, n_diseases)
+        block = (incidence[start:stop] @ incidence_t).tocsr()
+        block.setdiag(0, k=start)
+        block.eliminate_zeros()
+        yield start, block
+
+
+# Flatten a block into (i, j, shared) arrays, keeping j > i so each pair appears once
+def _block_pairs(start, block, min_shared=1):
+    coo = block.tocoo()
+    rows = coo.row + start
+    keep = (coo.col > rows) & (coo.data >= min_shared)
+    return rows[keep], coo.col[keep], coo.data[keep]
+
+
+def top_overlapping_pairs(incidence, n=10, block_size=2048):
+    best = []
+    for start, block in iter_overlap_blocks(incidence, block_size):
+        rows, cols, shared = _block_pairs(start, block)
+        if len(shared) > n:
+            idx = np.argpartition(shared, -n)[-n:]
+            rows, cols, shared = rows[idx], cols[idx], shared[idx]
+        for i, j, s in zip(rows, cols, shared):
+            item = (int(s), int(i), int(j))
+            if len(best) < n:
+                heapq.heappush(best, item)
+            else:
+                heapq.heappushpop(best, item)
+
+    return sorted(best, reverse=True)
+
+
+PAIR_COLUMNS = ['disease1', 'disease2', 'common_snps', 'snps1_only', 'snps2_only']
+
+
+# Truncate to just the header first, so a run with no qualifying pairs doesn't leave a stale file
+def _start_pair_file(output_file):
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    pd.DataFrame(columns=PAIR_COLUMNS).to_csv(output_file, index=False)
+
+
+def _pair_record(diseases, totals, i, j, shared):
+    return {
+        'disease1': diseases[i],
+        'disease2': diseases[j],
+        'common_snps': int(shared),
+        'snps1_only': int(totals[i] - shared),
+        'snps2_only': int(totals[j] - shared)
+    }
+
+
+# Top-K overlapping diseases for every disease, written as a CSV edge list
+def write_top_k_pairs(incidence, diseases, output_file, k=10, block_size=2048):
+    totals, _ = snp_totals(incidence)
+    _start_pair_file(output_file)
+
+    n_rows = 0
+    for start, block in iter_overlap_blocks(incidence, block_size):
+        records = []
+        for local in range(block.shape[0]):
+            lo, hi = block.indptr[local], block.indptr[local + 1]
+            if lo == hi:
+                continue
+            cols = block.indices[lo:hi]
+            shared = block.data[lo:hi]
+            if len(shared) > k:
+                idx = np.argpartition(shared, -k)[-k:]
+                cols, shared = cols[idx], shared[idx]
+            order = np.argsort(-shared, kind='stable')
+            i = start + local
+            for j, s in zip(cols[order], shared[order]):
+                records.append(_pair_record(diseases, totals, i, j, s))
+
+        if records:
+            pd.DataFrame(records, columns=PAIR_COLUMNS).to_csv(output_file, mode='a', header=False, index=False)
+            n_rows += len(records)
+
+    logger.info(f"Top-{k} overlap pairs written to {output_file} ({n_rows} rows)")
+    return n_rows
+
+
+# Every pair sharing at least min_shared SNPs, written as an undirected edge list
+def write_overlap_graph(incidence, diseases, output_file, min_shared=1, block_size=2048):
+    totals, _ = snp_totals(incidence)
+    _start_pair_file(output_file)
+
+    n_edges = 0
+    for start, block in iter_overlap_blocks(incidence, block_size):
+        rows, cols, shared = _block_pairs(start, block, min_shared)
+        if len(shared) == 0:
+            continue
+
+        edges = pd.DataFrame({
+            'disease1': np.asarray(diseases, dtype=object)[rows],
+            'disease2': np.asarray(diseases, dtype=object)[cols],
+            'common_snps': shared,
+            'snps1_only': totals[rows] - shared,
+            'snps2_only': totals[cols] - shared
+        })
+        edges.to_csv(output_file, mode='a', header=False, index=False)
+        n_edges += len(edges)
+
+    logger.info(f"Overlap graph (>= {min_shared} shared SNPs) written to {output_file} ({n_edges} edges)")
+    return n_edges